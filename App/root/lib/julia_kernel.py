@@ -0,0 +1,107 @@
+import numpy as np
+import threading
+
+try:
+    from numba import guvectorize
+except ImportError:  # Numba is optional, fall back to the masked NumPy kernel
+    guvectorize = None
+
+
+def _julia_numpy(x, y, cre, cim, iterations, out):
+    """
+    Pure NumPy version of the kernel, used when Numba is not installed.
+    """
+    c = complex(cre, cim)
+    # x and y broadcast to the (n, m) grid, and c stays a scalar.
+    z = (x + 1j * y).astype(np.complex64, copy=False)
+    m_matrix = np.ones(out.shape, dtype=bool)
+    out.fill(0)
+
+    for i in range(iterations):
+        z[m_matrix] = z[m_matrix] * z[m_matrix] + c
+        # Compare the squared modulus to 4 rather than paying a sqrt in np.abs.
+        np.logical_and(m_matrix, z.real * z.real + z.imag * z.imag <= 4.0, out=m_matrix)
+        if not m_matrix.any():
+            # Every pixel has escaped, the remaining iterations would be no-ops
+            break
+        out[m_matrix] = i
+    return out
+
+
+def _julia_row(x_row, y_val, cre, cim, iterations, out_row):
+    """
+    Computes the escape iteration of every pixel of one row of the grid.
+
+    Compiled as a gufunc, so NumPy broadcasting fans the rows out across
+    threads while LLVM vectorizes the loop along the row.
+
+    Args:
+        x_row: Real coordinates of the row, float32 of shape (m,).
+        y_val: Imaginary coordinate shared by the row, as a float32.
+        cre: Real part of the constant c, as a float32.
+        cim: Imaginary part of the constant c, as a float32.
+        iterations: Maximum number of iterations per pixel.
+        out_row: Output row, float32 of shape (m,).
+    """
+    for j in range(x_row.shape[0]):
+        zr = x_row[j]
+        zi = y_val
+        escape = 0
+        for k in range(iterations):
+            zr2 = zr * zr
+            zi2 = zi * zi
+            zi = (zr + zr) * zi + cim
+            zr = zr2 - zi2 + cre
+            if zr * zr + zi * zi > 4.0:
+                break
+            escape = k
+        out_row[j] = escape
+
+
+def _julia_gufunc(x, y, cre, cim, iterations, out):
+    """
+    Fills `out` with the escape iteration of every pixel of the Julia set grid.
+
+    Args:
+        x: Real coordinates, float32 of shape (1, m).
+        y: Imaginary coordinates, float32 of shape (n, 1).
+        cre: Real part of the constant c, as a float32.
+        cim: Imaginary part of the constant c, as a float32.
+        iterations: Maximum number of iterations per pixel.
+        out: Preallocated float32 array of shape (n, m), filled in place.
+
+    Returns:
+        The `out` array.
+    """
+    # Each Streamlit session runs in its own thread, and Numba's fallback
+    # "workqueue" threading layer aborts the process on concurrent parallel
+    # calls. One frame already uses every core, so serializing costs nothing.
+    with _julia_lock:
+        _julia_rows(x[0], y[:, 0], cre, cim, iterations, out)
+    return out
+
+
+_julia_lock = threading.Lock()
+
+if guvectorize is not None:
+    _julia_rows = guvectorize(
+        ["void(float32[:], float32, float32, float32, int64, float32[:])"],
+        "(m),(),(),(),()->(m)",
+        target="parallel",
+        fastmath=True,
+    )(_julia_row)
+    julia = _julia_gufunc
+else:
+    julia = _julia_numpy
+
+
+# Run once on import (the module stays in sys.modules across Streamlit
+# reruns) so the first animation frame doesn't pay any warm-up cost.
+julia(
+    np.zeros((1, 2), dtype=np.float32),
+    np.zeros((2, 1), dtype=np.float32),
+    np.float32(0.0),
+    np.float32(0.0),
+    1,
+    np.zeros((2, 2), dtype=np.float32),
+)
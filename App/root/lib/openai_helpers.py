@@ -0,0 +1,437 @@
+import streamlit as st
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, DefaultHttpxClient, OpenAI, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+import asyncio
+import base64
+import hashlib
+import httpx
+import io
+
+# Requests such as DALL-E 3 generations routinely take 10-20s, so allow well
+# beyond that before giving up (and letting _retry_transient try again).
+REQUEST_TIMEOUT = 60.0
+
+# Initialize the OpenAI client once and reuse it across reruns, sessions and
+# pages, so its keep-alive connection pool stays warm. The SDK's own retries are
+# disabled: transient errors are retried by _retry_transient below, so attempts
+# don't multiply. Pages whose calls aren't wrapped in that policy use
+# get_client().with_options(max_retries=2), which keeps the same connection pool.
+#
+# AsyncOpenAI clients can't be cached this way: they are bound to the event loop
+# of the asyncio.run() call that creates them, so they are created per call.
+@st.cache_resource
+def get_client() -> OpenAI:
+    return OpenAI(
+        api_key=st.secrets["OPENAI_API_KEY"],
+        max_retries=0,
+        timeout=REQUEST_TIMEOUT,
+        http_client=DefaultHttpxClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        ),
+    )
+
+# Retry rate limits, timeouts and connection errors with exponential backoff
+# and jitter, up to 3 attempts. Other errors (bad request, auth) fail at once.
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, APITimeoutError)),
+    reraise=True,
+)
+
+# --- Request parameters ---
+# Shared by the sync and async code paths so that both send the same requests.
+
+def _image_request(prompt: str, num_images: int = 1) -> dict:
+    if num_images > 1:
+        # DALL-E 3 only accepts n=1, while DALL-E 2 returns several images from
+        # a single request (one rate-limit hit and one round-trip for all of them)
+        return dict(
+            model="dall-e-2",
+            prompt=prompt,
+            size="1024x1024",
+            n=num_images,
+        )
+    return dict(
+        model="dall-e-3",  # Or "dall-e-2" if you prefer
+        prompt=prompt,
+        size="1024x1024",
+        quality="standard",
+        n=1,
+    )
+
+# OpenAI caches the processing of identical prompt prefixes of 1024 tokens or
+# more. This system prompt is long enough to qualify and must stay byte-identical
+# between requests: everything that varies goes in the user message after it.
+IMPROVE_PROMPT_SYSTEM = """You are a helpful assistant that improves image generation prompts. Make them more descriptive and creative for DALL-E.
+
+You receive a short draft prompt written by a user and return a single improved prompt that DALL-E can turn into a striking, coherent image. The improved prompt is pasted as is into an image generator, so it must work on its own.
+
+# Output rules
+
+- Return only the improved prompt: no preamble, no explanation, no quotes around it, no list, no markdown.
+- Write one paragraph of 40 to 90 words, in the language of the draft prompt.
+- Keep every subject, object, character, place and constraint the user asked for. Never remove or contradict part of the request, and never change the main subject.
+- Add detail rather than new subjects. A cat on a couch stays a cat on a couch; it gains a breed, a pose, a room, a light and a mood, not a second animal.
+- Do not ask questions. If the draft is ambiguous, pick the most natural reading and commit to it.
+- Do not include text to be rendered inside the image unless the user explicitly asked for it, and then quote it exactly.
+
+# What to describe
+
+Work through the following aspects and include those that help, in roughly this order:
+
+1. Subject: who or what is in the picture, with concrete physical details (species, age, clothing, materials, colors, textures, expression, pose, action).
+2. Setting: where the scene takes place, the time of day, the season, the weather and a few background elements that support the subject without competing with it.
+3. Composition: the framing (close-up, medium shot, wide shot, aerial view), the camera angle (eye level, low angle, top-down), the position of the subject in the frame and the depth of field.
+4. Lighting: the light source and its quality (soft window light, golden hour, neon glow, overcast daylight, candlelight, rim lighting, volumetric fog).
+5. Color palette: two or three dominant colors or a named palette (pastel, muted earth tones, high-contrast complementary colors, monochrome blue).
+6. Style and medium: photograph, digital painting, watercolor, oil painting, 3D render, pixel art, isometric illustration, paper cut-out, ink drawing, and any fitting artistic movement. Keep the style the user asked for; if none was given, choose the one that best serves the subject.
+7. Mood: one or two words for the overall feeling (serene, eerie, whimsical, triumphant, melancholic, cozy).
+
+# Style guidance
+
+- Prefer concrete, visual words over abstract praise. "Soft morning light through linen curtains" is useful; "beautiful, amazing, best quality, 4k, masterpiece" is not, so never add such tags.
+- Do not name living artists or copyrighted characters. Describe the visual traits of a style instead (for example "bold flat colors and thick black outlines" rather than an artist's name).
+- Avoid contradictory instructions such as "minimalist" together with "highly detailed busy background".
+- Avoid negative phrasing ("no people", "without trees"): DALL-E handles it poorly. Describe what is there instead.
+- Keep people respectful and non-sexualized, avoid real public figures, gore and anything that would breach the image generator's content policy. If the draft asks for such content, produce the closest acceptable scene.
+- Use commas and short clauses; a dense but readable sentence works better than a list of disconnected keywords.
+
+# Examples
+
+Draft: cat sitting on a couch
+Improved: A fluffy ginger Maine Coon cat sitting upright on a worn emerald velvet couch in a cozy living room, soft afternoon light streaming through linen curtains, dust motes floating in the air, a knitted blanket and a stack of old books beside it, shallow depth of field, warm earthy color palette, realistic photograph with gentle film grain, calm and content mood.
+
+Draft: a castle in the mountains
+Improved: A weathered stone castle with slender towers perched on a snowy mountain ridge at dawn, low clouds drifting through the valley below, first pink and golden sunlight catching the battlements, a winding path leading up to the gate, wide-angle view from a lower slope, cool blues contrasted with warm highlights, detailed digital painting in a romantic landscape style, majestic and quiet mood.
+
+Draft: robot cooking breakfast
+Improved: A friendly retro-styled robot with rounded brushed-aluminum panels and glowing teal eyes flipping pancakes in a bright 1950s kitchen, checkered floor, mint-green appliances, steam rising from the pan and a glass of orange juice on the counter, medium shot at eye level, cheerful pastel palette, playful 3D render with soft global illumination, whimsical mood.
+
+Draft: futuristic city at night
+Improved: A sprawling futuristic city at night seen from a rooftop terrace, rain-slick streets reflecting magenta and cyan neon signs, flying cars tracing light trails between towering glass skyscrapers, a lone figure in a long coat looking over the skyline, thin mist softening the distant towers, cinematic wide shot, high-contrast cyberpunk color palette, detailed digital art, moody and awe-inspiring atmosphere.
+
+Draft: watercolor fox
+Improved: A young red fox curled up asleep in a clearing of autumn leaves, its tail wrapped around its nose, birch trunks and a few falling leaves in the soft background, loose watercolor painting with visible paper texture, gentle bleeding edges and splashes of pigment, warm orange, ochre and muted green palette, peaceful and tender mood.
+
+Now improve the draft prompt given in the next message."""
+
+def _improve_prompt_request(user_text: str) -> dict:
+    return dict(
+        # Prompt caching only applies to gpt-4o and later models
+        model="gpt-4o-mini",  # Or "gpt-4o", etc.
+        messages=[
+            {"role": "system", "content": IMPROVE_PROMPT_SYSTEM},
+            {"role": "user", "content": f"Improve this prompt for DALL-E: '{user_text}'"}
+        ],
+        max_tokens=150,
+        n=1,
+        stop=None,
+        temperature=0.7,
+    )
+
+# --- Cached API calls ---
+# Identical inputs are served from Streamlit's cache instead of paying for a new
+# API call on every rerun. Errors propagate so that failures are never cached.
+
+def upload_digest(data: bytes) -> bytes:
+    """
+    Cache key for uploaded file contents.
+
+    Pass it to the cached function in place of the contents, which are given as an
+    underscore-prefixed argument so that Streamlit doesn't hash them itself: one
+    BLAKE2b pass instead of Streamlit's MD5 over multi-megabyte uploads.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+@_retry_transient
+def _create_image(prompt: str) -> str:
+    response = get_client().images.generate(**_image_request(prompt))
+    return response.data[0].url
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+@_retry_transient
+def _create_images(prompt: str, num_images: int) -> list:
+    response = get_client().images.generate(**_image_request(prompt, num_images))
+    return [image.url for image in response.data]
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_improved_prompt(user_text: str, _improved_prompt: str = None) -> str:
+    # Streaming writes into a placeholder, which a cached function can't do, so
+    # this cache is read and filled separately: without _improved_prompt a miss
+    # raises LookupError (exceptions aren't cached), with it the result is stored.
+    if _improved_prompt is None:
+        raise LookupError("No improved prompt cached for this text.")
+    return _improved_prompt
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+@_retry_transient
+def _analyze_image(_client, messages: list) -> str:
+    # The client is excluded from the cache key (leading underscore); the
+    # messages already embed the base64 image, detail level and prompt.
+    response = _client.chat.completions.create(
+        model="gpt-4o",  # Use gpt-4o for image understanding
+        messages=messages,
+        max_tokens=1000,
+    )
+    return response.choices[0].message.content
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+@_retry_transient
+def _create_variation(image_digest: bytes, _image_bytes: bytes) -> str:
+    # Sent as a (filename, bytes, mime) tuple: no temp file, and a retry simply
+    # re-sends the same bytes.
+    response = get_client().images.generate_variation(
+        image=("image.png", _image_bytes, "image/png"),
+        model="dall-e-2",
+        n=1,
+        size="1024x1024"
+    )
+    return response.data[0].url
+
+@_retry_transient
+def _improve_prompt(user_text: str) -> str:
+    response = get_client().chat.completions.create(**_improve_prompt_request(user_text))
+    return response.choices[0].message.content.strip()
+
+@_retry_transient
+def _open_improve_prompt_stream(user_text: str):
+    # Only opening the stream is retried: once tokens are on screen, a failure
+    # midway is reported rather than silently restarted.
+    return get_client().chat.completions.create(**_improve_prompt_request(user_text), stream=True)
+
+@_retry_transient
+async def _acreate_image(aclient: AsyncOpenAI, prompt: str) -> str:
+    response = await aclient.images.generate(**_image_request(prompt))
+    return response.data[0].url
+
+@_retry_transient
+async def _aimprove_prompt(aclient: AsyncOpenAI, user_text: str) -> str:
+    response = await aclient.chat.completions.create(**_improve_prompt_request(user_text))
+    return response.choices[0].message.content.strip()
+
+async def _compare_prompts_async(prompt: str) -> tuple:
+    async with AsyncOpenAI(
+        api_key=st.secrets["OPENAI_API_KEY"], max_retries=0, timeout=REQUEST_TIMEOUT
+    ) as aclient:
+        async def improved():
+            improved_prompt = await _aimprove_prompt(aclient, prompt)
+            return improved_prompt, await _acreate_image(aclient, improved_prompt)
+
+        # DALL-E on the original prompt overlaps with ChatGPT + DALL-E on the
+        # improved one, so the wall time is the longer branch, not the sum.
+        original_url, (improved_prompt, improved_url) = await asyncio.gather(
+            _acreate_image(aclient, prompt), improved()
+        )
+    return original_url, improved_prompt, improved_url
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _compare_prompts(prompt: str) -> tuple:
+    return asyncio.run(_compare_prompts_async(prompt))
+
+# --- 1. Création de méthodes pour DALL-E ---
+
+def openai_create_image(prompt: str) -> str:
+    """
+    This method should take a text prompt as input and use the DALL-E API from OpenAI
+    to generate an image based on the provided prompt. The generated image should be
+    returned as output of the method.
+    """
+    try:
+        return _create_image(prompt)
+    except Exception as e:
+        st.error(f"Error generating image with DALL-E: {e}")
+        return None
+
+def openai_create_images(prompt: str, num_images: int) -> list:
+    """
+    Generates several candidate images for the same prompt in a single DALL-E 2
+    request (DALL-E 3 only supports one image per request).
+
+    Returns:
+        list: The URLs of the generated images, or an empty list if an error occurs.
+    """
+    try:
+        return _create_images(prompt, num_images)
+    except Exception as e:
+        st.error(f"Error generating images with DALL-E: {e}")
+        return []
+
+def openai_compare_prompts(prompt: str) -> tuple:
+    """
+    Generates an image from the prompt as given and, concurrently, improves the
+    prompt with ChatGPT and generates a second image from the improved version.
+
+    Returns:
+        tuple: (original_url, improved_prompt, improved_url), or
+               (None, None, None) if an error occurs.
+    """
+    try:
+        return _compare_prompts(prompt)
+    except Exception as e:
+        st.error(f"Error comparing prompts with ChatGPT and DALL-E: {e}")
+        return None, None, None
+
+def openai_create_image_variation(image_bytes: bytes, prompt: str) -> str:
+    """
+    This method should take an existing image and a text prompt as input and use
+    the DALL-E API from OpenAI to create a variation of the image based on the prompt.
+    The image variation should be returned as output of the method.
+
+    Note: DALL-E 3 does not support image variations directly from an image.
+    This functionality is typically available with DALL-E 2.
+    For DALL-E 3, you would typically regenerate from a new prompt or modify the existing one.
+    This implementation uses DALL-E 2 for variation.
+    The 'image_bytes' should be the raw content of the image file.
+    """
+    try:
+        # For variations, DALL-E 2 is used and requires the image to be in a specific format
+        # and size.
+        return _create_variation(upload_digest(image_bytes), image_bytes)
+    except Exception as e:
+        st.error(f"Error creating image variation with DALL-E 2: {e}")
+        return None
+
+# --- 2. Connexion à l'API ChatGPT ---
+
+def generate_prompt_with_chatgpt(user_text: str, placeholder=None) -> str:
+    """
+    This method should take text provided by the user as input and use the ChatGPT API
+    to generate an improved text prompt based on the provided text. The improved prompt
+    should be returned as output of the method.
+
+    If a placeholder (e.g. from st.empty()) is given, a new completion is streamed
+    into it token by token. Either way, an already improved text is served from
+    the cache.
+    """
+    try:
+        try:
+            return _cached_improved_prompt(user_text)
+        except LookupError:
+            pass
+
+        if placeholder is None:
+            improved_prompt = _improve_prompt(user_text)
+        else:
+            buf = []
+            for chunk in _open_improve_prompt_stream(user_text):
+                if chunk.choices:
+                    buf.append(chunk.choices[0].delta.content or "")
+                    placeholder.markdown("".join(buf))
+            improved_prompt = "".join(buf).strip()
+
+        if improved_prompt:
+            _cached_improved_prompt(user_text, _improved_prompt=improved_prompt)
+        return improved_prompt
+    except Exception as e:
+        st.error(f"Error generating improved prompt with ChatGPT: {e}")
+        return None
+
+# --- Vision Method Class ---
+class VisionProcessor:
+    def __init__(self, openai_client):
+        # Initialize OpenAI client passed from the main app
+        self.client = openai_client
+
+    def encode_image(self, image_bytes):
+        """Encodes image bytes to a base64 string."""
+        # base64 output is pure ASCII, so the cheaper ascii codec is enough
+        return base64.b64encode(image_bytes).decode("ascii")
+
+    def prepare_image(self, image_bytes, detail="auto"):
+        """
+        Downscales an image to the resolution the Vision model actually uses and
+        re-encodes it as JPEG, so large photos aren't uploaded at full size.
+
+        With "low" detail the model sees a 512x512 image. Otherwise the image is
+        fit within 2048x2048 and its shortest side scaled to at most 768px.
+
+        Args:
+            image_bytes (bytes): Raw bytes of the image file, in any format Pillow reads.
+            detail (str): The detail level that will be requested ("low", "high" or "auto").
+
+        Returns:
+            bytes: The JPEG-encoded image.
+        """
+        # Imported here: Pillow is slow to import and only the Vision page needs
+        # it, while the chatbot and Whisper pages import this module for get_client
+        from PIL import Image, ImageOps
+
+        img = Image.open(io.BytesIO(image_bytes))
+        # The re-encoded JPEG carries no EXIF, so apply the Orientation tag
+        # (phone photos) to the pixels first
+        img = ImageOps.exif_transpose(img)
+        if detail == "low":
+            img.thumbnail((512, 512), Image.Resampling.LANCZOS)
+        else:
+            img.thumbnail((2048, 2048), Image.Resampling.LANCZOS)
+            scale = 768 / min(img.size)
+            if scale < 1:
+                img = img.resize((round(img.width * scale), round(img.height * scale)), Image.Resampling.LANCZOS)
+
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            # JPEG has no alpha: composite onto white, or transparent areas turn black
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True)
+        return buf.getvalue()
+
+    def vision_analyze_image(self, image_input_bytes, detail="auto", custom_prompt=None):
+        """
+        Analyzes an image using OpenAI's Vision model.
+
+        Args:
+            image_input_bytes (bytes | bytearray | memoryview): Raw bytes of the image file
+                                (e.g., from st.file_uploader's getvalue() or getbuffer()).
+            detail (str): Optional. Controls the level of detail in the response.
+                          Can be "low", "high", or "auto". Defaults to "auto".
+            custom_prompt (str): Optional. A custom prompt to guide the analysis.
+                                 If None, a default prompt is used.
+
+        Returns:
+            str: The analysis text from the OpenAI API.
+                 Returns None if an error occurs.
+        """
+        if not isinstance(image_input_bytes, (bytes, bytearray, memoryview)):
+            st.error("Invalid image input. Expected image bytes.")
+            return None
+        image_input_bytes = bytes(image_input_bytes)
+
+        try:
+            jpeg_bytes = self.prepare_image(image_input_bytes, detail)
+        except Exception as e:
+            st.error(f"Could not read the uploaded image: {e}")
+            return None
+
+        base64_image = self.encode_image(jpeg_bytes)
+
+        # Determine the content for the image
+        image_content = {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{base64_image}", # Always JPEG after prepare_image
+                "detail": detail  # Apply detail option
+            }
+        }
+
+        # Determine the prompt to use
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": custom_prompt if custom_prompt else "What’s in this image? Describe it in detail, including objects, colors, and any discernible text."},
+                    image_content
+                ],
+            }
+        ]
+
+        try:
+            return _analyze_image(self.client, messages)
+        except Exception as e:
+            st.error(f"An error occurred during image analysis: {e}")
+            return None
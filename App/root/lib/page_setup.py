@@ -0,0 +1,24 @@
+import streamlit as st
+
+def configure_page(title: str, layout: str = "centered") -> None:
+    """
+    Sets the browser tab title and the layout of the current page.
+
+    Call it before any other Streamlit element of the page.
+    """
+    st.set_page_config(page_title=title, layout=layout)
+
+def require_api_key(
+    error_message: str = "OpenAI API key not found in Streamlit secrets. "
+                         "Please add it to your .streamlit/secrets.toml file like: "
+                         "OPENAI_API_KEY = 'YOUR_API_KEY'",
+) -> str:
+    """
+    Returns the OpenAI API key from st.secrets.
+
+    If the key is missing, shows error_message and stops the page.
+    """
+    if "OPENAI_API_KEY" not in st.secrets:
+        st.error(error_message)
+        st.stop() # Stop the app if the key is not found
+    return st.secrets["OPENAI_API_KEY"]
@@ -0,0 +1,82 @@
+from openai import AsyncOpenAI
+import asyncio
+import re
+
+# Splits after ., ! or ? followed by whitespace, keeping the punctuation
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# TTS latency grows with the length of the input, so long texts are synthesized
+# as several ~200 character chunks in parallel.
+CHUNK_CHARS = 200
+
+# At most this many TTS requests are in flight at once, however long the text
+MAX_CONCURRENT_CHUNKS = 6
+
+def split_for_tts(text: str, max_chars: int = CHUNK_CHARS) -> list:
+    """
+    Groups the sentences of a text into chunks of at most max_chars characters.
+
+    Chunks only break on sentence boundaries, so a single sentence longer than
+    max_chars becomes a chunk of its own.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def _synthesize_chunk(aclient: AsyncOpenAI, text: str, voice: str, limit: asyncio.Semaphore) -> bytes:
+    # The streaming response hands over audio chunks as they are synthesized,
+    # so the download overlaps with generation instead of following it.
+    async with limit:
+        buf = bytearray()
+        async with aclient.audio.speech.with_streaming_response.create(
+            model="tts-1",
+            voice=voice,
+            input=text,
+            response_format="mp3",
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size=4096):
+                buf.extend(chunk)
+        return bytes(buf)
+
+async def synthesize_speech(aclient: AsyncOpenAI, text: str, voice: str) -> bytes:
+    """
+    Converts text to MP3 speech, synthesizing up to MAX_CONCURRENT_CHUNKS of
+    its chunks concurrently. If one chunk fails, the others are cancelled.
+
+    MP3 has no global header, so the chunks' audio can simply be concatenated
+    frame by frame, without re-encoding.
+
+    Args:
+        aclient: The AsyncOpenAI client to send the requests with.
+        text: The text to read.
+        voice: The TTS voice, e.g. "alloy" or "onyx".
+
+    Returns:
+        bytes: The MP3 audio of the whole text.
+
+    Raises:
+        ValueError: If the text is empty or only whitespace.
+    """
+    chunks = split_for_tts(text)
+    if not chunks:
+        raise ValueError("Cannot synthesize speech from empty text.")
+    # The semaphore is bound to the running event loop, so it is created per call
+    limit = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+    tasks = [asyncio.create_task(_synthesize_chunk(aclient, chunk, voice, limit)) for chunk in chunks]
+    try:
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        # gather doesn't stop the other tasks: cancel them so that the remaining
+        # requests aren't sent (and billed) for a result that is thrown away
+        for task in tasks:
+            task.cancel()
+        raise
+    return b"".join(parts)
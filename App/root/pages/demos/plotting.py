@@ -4,22 +4,36 @@ import time
 
 st.write("Plotting Page for Streamlit")
 
-progress_bar = st.sidebar.progress(0)
-status_text = st.sidebar.empty()
-last_rows = np.random.randn(1, 1)  # noqa: NPY002
-chart = st.line_chart(last_rows)
-
-for i in range(1, 101):
-    new_rows = last_rows[-1, :] + np.random.randn(5, 1).cumsum(axis=0)  # noqa: NPY002
-    status_text.text(f"{i}% complete")
-    chart.add_rows(new_rows)
-    progress_bar.progress(i)
-    last_rows = new_rows
-    time.sleep(0.05)
-
-progress_bar.empty()
-
-# Streamlit widgets automatically run the script from top to bottom. Since
-# this button is not connected to any other logic, it just causes a plain
-# rerun.
-st.button("Rerun")
\ No newline at end of file
+rng = np.random.default_rng()
+
+# The walk is sent to the chart in batches: fewer, larger messages to the
+# browser instead of one per 5 rows.
+BATCH_ROWS = 25
+
+# The Rerun button only reruns this fragment, not the whole page.
+@st.fragment
+def render_chart():
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    last_rows = rng.standard_normal((1, 1))
+    chart = st.line_chart(last_rows)
+
+    # Draw the whole random walk up front, then stream it in batches.
+    all_rows = last_rows[-1, :] + rng.standard_normal((500, 1)).cumsum(axis=0)
+
+    for start in range(0, len(all_rows), BATCH_ROWS):
+        end = start + BATCH_ROWS
+        chart.add_rows(all_rows[start:end])
+
+        percent = end * 100 // len(all_rows)
+        status_text.text(f"{percent}% complete")
+        progress_bar.progress(percent)
+        time.sleep(0.25)
+
+    progress_bar.empty()
+
+    # This button is not connected to any other logic, it just causes a
+    # rerun of the fragment, drawing a new random walk.
+    st.button("Rerun")
+
+render_chart()
@@ -1,9 +1,16 @@
-from openai import OpenAI
 import streamlit as st
 
+from root.lib.openai_helpers import get_client
+from root.lib.page_setup import configure_page, require_api_key
+
+configure_page("ChatGPT-like clone")
+
 st.title("ChatGPT-like clone")
 
-client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+# get_client reads the key from st.secrets
+require_api_key()
+
+client = get_client().with_options(max_retries=2)
 
 if "openai_model" not in st.session_state:
     st.session_state["openai_model"] = "gpt-3.5-turbo"
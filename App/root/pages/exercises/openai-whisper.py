@@ -1,87 +1,97 @@
 import streamlit as st
-from openai import OpenAI
-import os
+from openai import AsyncOpenAI
+import asyncio
 
-# --- Configuration ---
-# Load OpenAI API key from Streamlit's secrets
-try:
-    OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
-except KeyError:
-    st.error("OpenAI API key not found in Streamlit secrets. Please add it to .streamlit/secrets.toml")
-    st.stop() # Stop the app if the key is not found
+from root.lib.openai_helpers import get_client, upload_digest
+from root.lib.page_setup import configure_page, require_api_key
+from root.lib.tts import synthesize_speech
+
+configure_page("Audio Processing App")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# --- Configuration ---
+# Load OpenAI API key from Streamlit's secrets (read by get_client)
+OPENAI_API_KEY = require_api_key()
+
+client = get_client().with_options(max_retries=2)
+
+# --- Cached API calls ---
+# Transcripts don't expire, so they are also persisted to disk and survive a
+# server restart (a TTL would be ignored with persist="disk"). The audio is keyed
+# by its upload_digest, the bytes themselves are excluded from the cache key
+# (leading underscore).
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def _transcribe(audio_digest: bytes, _audio_bytes: bytes, filename: str, mime_type: str) -> str:
+    # The filename and MIME type only tell the API which audio format it is receiving
+    return client.audio.transcriptions.create(model="whisper-1", file=(filename, _audio_bytes, mime_type)).text
+
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def _translate(audio_digest: bytes, _audio_bytes: bytes, filename: str, mime_type: str) -> str:
+    return client.audio.translations.create(model="whisper-1", file=(filename, _audio_bytes, mime_type)).text
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _text_to_speech(text: str) -> bytes:
+    async def synthesize():
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=2) as aclient:
+            return await synthesize_speech(aclient, text, voice="alloy") # You can choose other voices like 'nova', 'shimmer', 'echo', 'fable', 'onyx'
+    return asyncio.run(synthesize())
 
 # --- 1. Créer une méthode openai_transcribe ---
-def openai_transcribe(audio_file_path: str) -> str:
+def openai_transcribe(file_tuple: tuple) -> str:
     """
     Transcribes an audio file using OpenAI Whisper.
 
     Args:
-        audio_file_path: The path to the audio file.
+        file_tuple: The audio file as a (filename, bytes, mime_type) tuple, e.g.
+            (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type).
 
     Returns:
         The transcribed text.
     """
+    filename, audio_bytes, mime_type = file_tuple
     try:
-        with open(audio_file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file
-            )
-        return transcript.text
+        return _transcribe(upload_digest(audio_bytes), audio_bytes, filename, mime_type)
     except Exception as e:
         st.error(f"Error during transcription: {e}")
         return ""
 
 # --- 2. Créer une méthode openai_translate ---
-def openai_translate(audio_file_path: str) -> str:
+def openai_translate(file_tuple: tuple) -> str:
     """
     Translates an audio file into English using OpenAI Whisper.
 
     Args:
-        audio_file_path: The path to the audio file.
+        file_tuple: The audio file as a (filename, bytes, mime_type) tuple, e.g.
+            (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type).
 
     Returns:
         The translated text (in English).
     """
+    filename, audio_bytes, mime_type = file_tuple
     try:
-        with open(audio_file_path, "rb") as audio_file:
-            translation = client.audio.translations.create(
-                model="whisper-1",
-                file=audio_file
-            )
-        return translation.text
+        return _translate(upload_digest(audio_bytes), audio_bytes, filename, mime_type)
     except Exception as e:
         st.error(f"Error during translation: {e}")
         return ""
 
 # --- 3. Créer une méthode text_to_speech ---
-def text_to_speech(text: str, output_audio_path: str = "output.mp3"):
+def text_to_speech(text: str) -> bytes:
     """
     Converts text to speech using OpenAI's Text-to-Speech model.
 
     Args:
         text: The text to convert.
-        output_audio_path: The path to save the generated audio file.
+
+    Returns:
+        The generated MP3 audio, as bytes.
     """
     try:
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice="alloy", # You can choose other voices like 'nova', 'shimmer', 'echo', 'fable', 'onyx'
-            input=text,
-        )
-        response.stream_to_file(output_audio_path)
-        st.success(f"Text-to-speech audio saved to {output_audio_path}")
-        return output_audio_path
+        return _text_to_speech(text)
     except Exception as e:
         st.error(f"Error during text-to-speech conversion: {e}")
         return None
 
 # --- 4. Ajouter une page 'Transcription' à votre application Streamlit ---
 
-st.set_page_config(page_title="Audio Processing App", layout="centered")
-
 st.title("Audio Processing with OpenAI")
 
 # Navigation (optional for a single-page app, but good practice for multi-page)
@@ -92,62 +102,62 @@ if page == "Transcription & Translation":
     st.header("Transcription & Translation")
     st.write("Upload an audio file to transcribe it or translate it to English.")
 
-    uploaded_file = st.file_uploader("Choose an audio file...", type=["mp3", "wav", "m4a", "ogg", "flac"])
-
-    if uploaded_file is not None:
-        # Save the uploaded file temporarily
-        with open(os.path.join("temp_audio", uploaded_file.name), "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        audio_path = os.path.join("temp_audio", uploaded_file.name)
+    # Inside a fragment, clicking a button only reruns this block, not the whole page
+    @st.fragment
+    def transcription_block():
+        uploaded_file = st.file_uploader("Choose an audio file...", type=["mp3", "wav", "m4a", "ogg", "flac"])
 
-        st.audio(uploaded_file, format=uploaded_file.type)
+        if uploaded_file is not None:
+            # Sent to the API straight from memory, no temporary file needed.
+            # getvalue() shares the upload's buffer rather than copying it.
+            audio_file = (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)
 
-        if st.button("Transcribe"):
-            with st.spinner("Transcribing..."):
-                transcribed_text = openai_transcribe(audio_path)
-            if transcribed_text:
-                st.subheader("Transcription:")
-                st.info(transcribed_text)
+            st.audio(uploaded_file, format=uploaded_file.type)
 
-        if st.button("Translate to English"):
-            with st.spinner("Translating..."):
-                translated_text = openai_translate(audio_path)
-            if translated_text:
-                st.subheader("Translation (English):")
-                st.info(translated_text)
+            if st.button("Transcribe"):
+                with st.spinner("Transcribing..."):
+                    transcribed_text = openai_transcribe(audio_file)
+                if transcribed_text:
+                    st.subheader("Transcription:")
+                    st.info(transcribed_text)
 
-        # Clean up the temporary file
-        os.remove(audio_path)
+            if st.button("Translate to English"):
+                with st.spinner("Translating..."):
+                    translated_text = openai_translate(audio_file)
+                if translated_text:
+                    st.subheader("Translation (English):")
+                    st.info(translated_text)
 
-        # Ensure temp_audio directory is removed if empty (optional)
-        if not os.listdir("temp_audio"):
-            os.rmdir("temp_audio")
+    transcription_block()
 
 elif page == "Text-to-Speech":
     st.header("Text-to-Speech")
     st.write("Enter text to convert it into an audio file.")
 
-    input_text = st.text_area("Enter text here:", height=200)
-
-    if st.button("Generate Audio"):
-        if input_text:
-            with st.spinner("Generating audio..."):
-                output_audio_file = text_to_speech(input_text)
-            if output_audio_file:
-                st.subheader("Generated Audio:")
-                st.audio(output_audio_file)
-                # Option to download
-                with open(output_audio_file, "rb") as file:
-                    btn = st.download_button(
-                        label="Download Audio",
-                        data=file,
-                        file_name="generated_audio.mp3",
-                        mime="audio/mp3"
-                    )
-                os.remove(output_audio_file) # Clean up generated file
-        else:
-            st.warning("Please enter some text to generate audio.")
-
-# Create a temporary directory if it doesn't exist
-if not os.path.exists("temp_audio"):
-    os.makedirs("temp_audio")
\ No newline at end of file
+    @st.fragment
+    def text_to_speech_block():
+        input_text = st.text_area("Enter text here:", height=200)
+
+        if st.button("Generate Audio"):
+            if input_text.strip():
+                with st.spinner("Generating audio..."):
+                    output_audio = text_to_speech(input_text)
+                if output_audio:
+                    # Kept in session_state so the player survives reruns (e.g. the download click)
+                    st.session_state["last_tts_audio"] = output_audio
+            else:
+                st.warning("Please enter some text to generate audio.")
+
+        if "last_tts_audio" in st.session_state:
+            output_audio = st.session_state["last_tts_audio"]
+            st.subheader("Generated Audio:")
+            st.audio(output_audio, format="audio/mp3")
+            # Option to download
+            st.download_button(
+                label="Download Audio",
+                data=output_audio,
+                file_name="generated_audio.mp3",
+                mime="audio/mp3"
+            )
+
+    text_to_speech_block()
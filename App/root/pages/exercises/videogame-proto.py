@@ -1,48 +1,100 @@
 import streamlit as st
-import openai
-import requests
-from io import BytesIO
-from PIL import Image
-import base64
+from openai import AsyncOpenAI
+import asyncio
+import re
+import httpx
+
+from root.lib.page_setup import configure_page, require_api_key
+from root.lib.tts import synthesize_speech
+
+configure_page("Prototypage de Jeu Vidéo par IA", layout="wide")
 
 # Set your OpenAI API key
-try:
-    openai.api_key = st.secrets["OPENAI_API_KEY"]
-except KeyError:
-    st.error("Clé API OpenAI introuvable. Veuillez la définir dans les secrets Streamlit.")
-    st.stop()
-
-st.set_page_config(layout="wide", page_title="Prototypage de Jeu Vidéo par IA")
-
-def generate_game_idea(genre, mood, keywords):
-    """Génère un titre de jeu, un genre et un résumé à l'aide de GPT-4o."""
-    # Rendre le prompt plus strict pour s'assurer que les étiquettes (Title:, Genre:, Summary:) sont toujours présentes
-    prompt = f"""Proposez une idée de jeu vidéo innovante. Le jeu doit être un jeu de {genre}, avec une atmosphère {mood}. Incorporez les mots-clés suivants : {keywords}.
-    
-    Veuillez formater votre réponse comme suit :
-    Title: [Votre titre de jeu ici]
-    Genre: [Votre genre de jeu ici]
-    Summary: [Votre résumé concis (environ 100-150 mots) ici]
+OPENAI_API_KEY = require_api_key("Clé API OpenAI introuvable. Veuillez la définir dans les secrets Streamlit.")
+
+# OpenAI met en cache le traitement des préfixes de prompt identiques d'au moins
+# 1024 tokens. Ce prompt système est assez long pour en bénéficier et doit rester
+# identique octet pour octet d'une requête à l'autre : tout ce qui varie (genre,
+# ambiance, mots-clés) est placé dans le message utilisateur, après lui.
+GAME_DESIGNER_SYSTEM_PROMPT = """Vous êtes un assistant créatif de concepteur de jeux. Votre objectif est de générer des concepts de jeu clairs et formatés précisément.
+
+L'utilisateur vous donne un genre, une ambiance et une liste de mots-clés. Vous proposez une idée de jeu vidéo innovante qui respecte ces trois contraintes. Votre réponse est analysée automatiquement par un programme, ligne par ligne, puis le titre et le genre servent à générer une pochette avec DALL-E et le résumé est lu à voix haute par une synthèse vocale.
+
+# Format de réponse (obligatoire)
+
+Répondez exactement avec les trois lignes suivantes, dans cet ordre, et rien d'autre :
+Title: [Votre titre de jeu ici]
+Genre: [Votre genre de jeu ici]
+Summary: [Votre résumé concis (environ 100-150 mots) ici]
+
+Règles de format :
+- Les étiquettes Title:, Genre: et Summary: sont écrites en anglais, exactement ainsi, en début de ligne, suivies d'un espace.
+- Chaque étiquette et sa valeur tiennent sur une seule ligne. Le résumé ne contient aucun saut de ligne.
+- N'ajoutez ni introduction, ni conclusion, ni titre de section, ni markdown (pas de gras, pas d'italique, pas de puces, pas de guillemets autour des valeurs).
+- Écrivez les valeurs en français.
+- Le titre est court (deux à six mots), mémorable, facile à prononcer et ne reprend pas le nom d'un jeu existant.
+- Le genre reprend le genre demandé, éventuellement précisé par un sous-genre (par exemple « RPG tactique », « Puzzle narratif », « Action roguelite »).
+
+# Contenu du résumé
+
+Le résumé fait environ 100 à 150 mots et se lit naturellement à voix haute. Il présente, dans cet ordre :
+1. L'univers et le point de départ : où et quand se déroule le jeu, et ce qui vient de se produire.
+2. Le personnage joueur ou le rôle du joueur, et son objectif principal.
+3. La mécanique centrale qui rend le jeu original, décrite concrètement (ce que le joueur fait minute après minute), et la façon dont elle évolue au fil de la partie.
+4. L'ambiance visuelle et sonore, en cohérence avec l'ambiance demandée.
+5. Une phrase finale qui donne envie de jouer.
+
+# Règles de création
+
+- Intégrez tous les mots-clés fournis de manière significative, dans l'univers, les personnages ou les mécaniques, et pas seulement sous forme d'une énumération.
+- L'ambiance demandée doit se ressentir dans le ton du résumé, le choix des mots et l'univers.
+- Privilégiez une idée de gameplay précise et réalisable plutôt qu'une liste de fonctionnalités vagues (« monde ouvert immense », « choix qui comptent ») sans explication.
+- Évitez les clichés non assumés et les copies évidentes de licences existantes. Ne citez aucune marque, aucun studio et aucun personnage protégé.
+- Restez adapté à un large public : pas de violence gratuite détaillée, pas de contenu sexuel, pas de propos discriminatoires. Une ambiance sombre ou horrifique est possible, suggérée plutôt que montrée.
+- Le titre et le genre doivent suffire à imaginer une pochette : évitez les titres purement abstraits.
+- N'utilisez pas d'abréviations ou de symboles difficiles à lire pour une synthèse vocale.
+
+# Exemples
+
+Demande : genre Puzzle, ambiance Confortable, mots-clés : thé, bibliothèque, chat
+Title: Le Salon des Pages Perdues
+Genre: Puzzle narratif
+Summary: Dans une vieille bibliothèque de quartier, les livres ont perdu leurs dernières pages et les histoires se mélangent. Vous incarnez Mina, une apprentie bibliothécaire accompagnée d'un chat roux qui sait toujours où se cachent les fragments. Chaque énigme consiste à réassembler une page en replaçant des phrases, des illustrations et des taches de thé sur une table en bois, en choisissant quelles scènes relient deux récits. Plus vous avancez, plus les histoires réparées transforment la bibliothèque : des étagères s'ouvrent, une serre apparaît, des lecteurs reviennent. Les aquarelles douces, le crépitement de la cheminée et une musique au piano accompagnent chaque soirée de jeu. Une tasse à la main, laissez-vous porter par une aventure paisible où chaque page retrouvée rallume une petite lumière.
+
+Demande : genre Action, ambiance Futuriste, mots-clés : gravité, course, satellite
+Title: Orbite Zéro
+Genre: Action de course
+Summary: En 2190, la dernière course illégale du système solaire se dispute autour d'un satellite abandonné, dont le champ de gravité artificiel se dérègle à chaque tour. Vous pilotez Kael, un ancien mécanicien qui veut racheter la station où il a grandi. La mécanique centrale repose sur l'inversion de gravité : d'une pression, votre véhicule colle au plafond, aux parois ou à l'extérieur de la coque, ce qui ouvre des raccourcis et permet de piéger les rivaux. Chaque circuit se déforme au fil des tours, obligeant à relire la piste en permanence. Néons froids, reflets métalliques et musique électronique pulsée donnent un rythme effréné. Tenez-vous prêt : ici, le haut et le bas ne sont qu'une question de réflexes.
+
+Répondez maintenant à la demande donnée dans le message suivant."""
+
+async def generate_game_idea(aclient, genre, mood, keywords):
     """
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "Vous êtes un assistant créatif de concepteur de jeux. Votre objectif est de générer des concepts de jeu clairs et formatés précisément."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=400, # Augmenter les tokens pour s'assurer que le résumé est complet
-            temperature=0.8
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        st.error(f"Erreur lors de la génération de l'idée de jeu : {e}")
-        return None
+    Génère un titre de jeu, un genre et un résumé à l'aide de GPT-4o.
+
+    La réponse est diffusée en streaming : les fragments de texte sont renvoyés au fur
+    et à mesure de leur arrivée, au lieu d'attendre la réponse complète.
+    """
+    # Seules les valeurs variables figurent dans le message utilisateur, le format est dans le prompt système
+    prompt = f"Demande : genre {genre}, ambiance {mood}, mots-clés : {keywords}"
+    stream = await aclient.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": GAME_DESIGNER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=400, # Augmenter les tokens pour s'assurer que le résumé est complet
+        temperature=0.8,
+        stream=True,
+    )
+    async for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
 
-def generate_image_from_text(prompt_text):
+async def generate_image_from_text(aclient, prompt_text):
     """Génère une image à l'aide de DALL-E 3."""
     try:
-        response = openai.images.generate(
+        response = await aclient.images.generate(
             model="dall-e-3",
             prompt=f"Pochette de jeu vidéo : {prompt_text}",
             size="1024x1024",
@@ -55,33 +107,146 @@ def generate_image_from_text(prompt_text):
         st.error(f"Erreur lors de la génération de l'image : {e}")
         return None
 
-def generate_speech_from_text(text_to_speak):
+async def generate_speech_from_text(aclient, text_to_speak):
     """Génère de l'audio à partir du texte à l'aide de l'API OpenAI TTS."""
     try:
-        response = openai.audio.speech.create(
-            model="tts-1",
-            voice="onyx",
-            input=text_to_speak
-        )
-        return response.content
+        # Le texte est découpé en phrases synthétisées en parallèle, puis les MP3 sont concaténés
+        return await synthesize_speech(aclient, text_to_speak, voice="onyx")
     except Exception as e:
         st.error(f"Erreur lors de la génération de la parole : {e}")
         return None
 
-def display_image_from_url(url):
-    """Affiche une image à partir d'une URL."""
-    if url:
+# Chaque étiquette et sa valeur, jusqu'à l'étiquette suivante ou la fin du texte :
+# un saut de ligne parasite dans le résumé ne le tronque plus
+CONCEPT_FIELD_RE = re.compile(r"^\s*(Title|Genre|Summary):[ \t]*(.*?)\s*(?=^\s*(?:Title|Genre|Summary):|\Z)", re.M | re.S)
+
+async def fetch_image(http, url):
+    """Télécharge l'image générée (PNG), pour le bouton de téléchargement."""
+    try:
+        response = await http.get(url)
+        response.raise_for_status()
+        return response.content
+    except Exception as e:
+        st.error(f"Erreur lors du téléchargement de l'image : {e}")
+        return None
+
+async def generate_cover(aclient, http, prompt_text):
+    """
+    Génère une pochette puis la télécharge aussitôt, pendant que les autres pochettes et
+    le résumé vocal sont encore en cours.
+
+    Renvoie (url, octets PNG), ou None si la génération échoue.
+    """
+    image_url = await generate_image_from_text(aclient, prompt_text)
+    if image_url is None:
+        return None
+    return image_url, await fetch_image(http, image_url)
+
+def parse_game_concept(game_concept_raw):
+    """Extrait le titre, le genre et le résumé du texte généré par GPT."""
+    # Une seule passe sur le texte, les espaces et sauts de ligne internes sont normalisés
+    fields = {label: " ".join(value.split()) for label, value in CONCEPT_FIELD_RE.findall(game_concept_raw)}
+    game_title = fields.get("Title") or "N/A"
+    game_genre = fields.get("Genre") or "N/A"
+    game_summary = fields.get("Summary") or "Aucun résumé généré."
+    return game_title, game_genre, game_summary
+
+def image_prompt_for(game_title, game_genre, mood, keywords):
+    """Construit le prompt DALL-E de la pochette à partir du titre et du genre."""
+    return f"Pochette de jeu vidéo pour un jeu de {game_genre} intitulé '{game_title}', à l'ambiance {mood}. Représentez les thèmes : {keywords}"
+
+async def run_pipeline(genre, mood, keywords, num_images=1, placeholder=None):
+    """
+    Génère le concept (GPT) en streaming, les pochettes (DALL-E) et le résumé vocal (TTS).
+
+    Les pochettes sont lancées dès que les lignes Title: et Genre: sont complètes, pendant
+    que le résumé est encore en cours de génération. DALL-E 3 ne produit qu'une image par
+    requête : les num_images variantes sont donc demandées en parallèle. Si un placeholder
+    (st.empty()) est fourni, le texte du concept y est affiché au fur et à mesure.
+
+    Chaque pochette est téléchargée dès sa génération, en parallèle du TTS.
+
+    Renvoie un dictionnaire (title, genre, summary, image_prompt, images, audio), où images est
+    une liste de (url, octets PNG), ou None si la génération du concept échoue.
+    """
+    # Les clients asynchrones sont liés à la boucle d'événements de cet asyncio.run(),
+    # ils sont donc créés à chaque exécution plutôt que mis en cache.
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY) as aclient, httpx.AsyncClient(timeout=30) as http:
+        game_concept_raw = ""
+        image_prompt_for_dalle = None
+        image_tasks = []
         try:
-            response = requests.get(url)
-            img = Image.open(BytesIO(response.content))
-            st.image(img, caption="Pochette du jeu", use_container_width=True)
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            href = f'<a href="data:file/png;base64,{img_str}" download="pochette_jeu.png">Télécharger l\'image</a>'
-            st.markdown(href, unsafe_allow_html=True)
+            async for token in generate_game_idea(aclient, genre, mood, keywords):
+                game_concept_raw += token
+                if placeholder is not None:
+                    placeholder.markdown(game_concept_raw)
+                if not image_tasks:
+                    # Seules les lignes terminées sont analysées, la dernière peut être partielle
+                    game_title, game_genre, _ = parse_game_concept(game_concept_raw.rpartition("\n")[0])
+                    if game_title != "N/A" and game_genre != "N/A":
+                        image_prompt_for_dalle = image_prompt_for(game_title, game_genre, mood, keywords)
+                        image_tasks = [asyncio.create_task(generate_cover(aclient, http, image_prompt_for_dalle)) for _ in range(num_images)]
         except Exception as e:
-            st.error(f"Erreur lors de l'affichage de l'image : {e}")
+            st.error(f"Erreur lors de la génération de l'idée de jeu : {e}")
+            for task in image_tasks:
+                task.cancel()
+            return None
+        if not game_concept_raw:
+            return None
+        game_title, game_genre, game_summary = parse_game_concept(game_concept_raw)
+
+        # Réponse sans saut de ligne après le genre : les pochettes ne sont lancées qu'à la fin
+        if not image_tasks:
+            image_prompt_for_dalle = image_prompt_for(game_title, game_genre, mood, keywords)
+            image_tasks = [asyncio.create_task(generate_cover(aclient, http, image_prompt_for_dalle)) for _ in range(num_images)]
+        tts_task = None
+        if game_summary and game_summary != "Aucun résumé généré.":
+            tts_task = asyncio.create_task(generate_speech_from_text(aclient, game_summary))
+        await asyncio.gather(*image_tasks, *(task for task in (tts_task,) if task))
+
+    # Les variantes en échec (None) sont ignorées
+    images = [task.result() for task in image_tasks if task.result()]
+    audio_bytes = tts_task.result() if tts_task else None
+    return {
+        "title": game_title,
+        "genre": game_genre,
+        "summary": game_summary,
+        "image_prompt": image_prompt_for_dalle,
+        "images": images,
+        "audio": audio_bytes,
+        "complete": (
+            len(images) == num_images
+            and all(png_bytes for _, png_bytes in images)
+            and (tts_task is None or audio_bytes is not None)
+        ),
+    }
+
+# Le pipeline écrit dans un placeholder pendant le streaming, ce qu'une fonction
+# mise en cache ne peut pas faire. Le cache est donc consulté et rempli à part :
+# sans _concept, un échec de lecture lève LookupError (les exceptions ne sont pas
+# mises en cache) ; avec _concept (exclu de la clé), le concept est enregistré.
+# max_entries est réduit car chaque entrée contient les octets PNG des pochettes.
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def cached_concept(genre, mood, keywords, num_images, _concept=None):
+    """Renvoie le concept complet déjà généré pour ces paramètres, ou lève LookupError."""
+    if _concept is None:
+        raise LookupError("Aucun concept en cache pour ces paramètres.")
+    return _concept
+
+def display_image(url, png_bytes, filename="pochette_jeu.png"):
+    """Affiche une image, avec un bouton pour la télécharger."""
+    # Les URL DALL-E expirent au bout d'environ une heure, alors que le concept reste
+    # dans session_state : les octets déjà téléchargés sont donc affichés en priorité
+    st.image(png_bytes or url, caption="Pochette du jeu", use_container_width=True)
+    if png_bytes:
+        # DALL-E renvoie déjà un PNG : les octets sont servis tels quels, et seulement au clic
+        st.download_button(
+            "Télécharger l'image",
+            data=png_bytes,
+            file_name=filename,
+            mime="image/png",
+            key=f"download_{filename}",
+        )
 
 def transcribe_audio(audio_file):
     """Espace réservé pour la transcription de l'API Whisper."""
@@ -104,77 +269,92 @@ Générez des concepts de jeu avec GPT, créez de superbes pochettes avec DALL-E
 ### 💡 Génération d'Idée de Jeu, d'Image et de Synthèse Vocale (GPT, DALL-E, TTS)
 
 st.header("1. Générer une Idée de Jeu, une Image et un Résumé Vocal")
-col1, col2 = st.columns(2)
 
-with col1:
-    selected_genre = st.selectbox(
-        "Sélectionnez un Genre :",
-        ["Action", "Aventure", "RPG", "Stratégie", "Simulation", "Puzzle", "Horreur", "Sci-Fi", "Fantasy", "Sports"]
-    )
-    selected_mood = st.selectbox(
-        "Sélectionnez une Ambiance :",
-        ["Épique", "Mystérieuse", "Humoristique", "Sombre", "Légère", "Brute", "Futuriste", "Historique", "Confortable"]
-    )
-    keywords_input = st.text_input(
-        "Entrez des Mots-clés (séparés par des virgules) :",
-        "magie, ruines antiques, héros courageux"
-    )
+# Dans un fragment, la soumission du formulaire ne relance que ce bloc, pas toute la page
+@st.fragment
+def concept_block():
+    # Dans un formulaire, modifier un champ ne relance pas le script : tout est
+    # envoyé en une seule fois à la soumission
+    with st.form("concept_form"):
+        col1, col2 = st.columns(2)
 
-generate_all_button = st.button("Générer le Concept de Jeu, l'Image et le Résumé Vocal")
-
-if generate_all_button:
-    if selected_genre and selected_mood and keywords_input:
-        with st.spinner("Génération du concept de jeu, de l'image et du résumé vocal..."):
-            # 1. Génération de l'idée de jeu (GPT)
-            game_concept_raw = generate_game_idea(selected_genre, selected_mood, keywords_input)
-
-            if game_concept_raw:
-                # Initialiser les variables pour le concept de jeu
-                game_title = "N/A"
-                game_genre = "N/A"
-                game_summary = "Aucun résumé généré."
-
-                # Analyse améliorée du texte généré par GPT
-                for line in game_concept_raw.split('\n'):
-                    if line.strip().startswith("Title:"):
-                        game_title = line.replace("Title:", "").strip()
-                    elif line.strip().startswith("Genre:"):
-                        game_genre = line.replace("Genre:", "").strip()
-                    elif line.strip().startswith("Summary:"):
-                        game_summary = line.replace("Summary:", "").strip()
+        with col1:
+            selected_genre = st.selectbox(
+                "Sélectionnez un Genre :",
+                ["Action", "Aventure", "RPG", "Stratégie", "Simulation", "Puzzle", "Horreur", "Sci-Fi", "Fantasy", "Sports"]
+            )
+            selected_mood = st.selectbox(
+                "Sélectionnez une Ambiance :",
+                ["Épique", "Mystérieuse", "Humoristique", "Sombre", "Légère", "Brute", "Futuriste", "Historique", "Confortable"]
+            )
+            keywords_input = st.text_input(
+                "Entrez des Mots-clés (séparés par des virgules) :",
+                "magie, ruines antiques, héros courageux"
+            )
+            num_images = st.slider(
+                "Nombre de pochettes :", 1, 4, 1,
+                help="Les variantes sont générées en parallèle, le temps d'attente reste celui d'une seule image."
+            )
 
+        generate_all_button = st.form_submit_button("Générer le Concept de Jeu, l'Image et le Résumé Vocal")
+
+    if generate_all_button:
+        if selected_genre and selected_mood and keywords_input:
+            with st.spinner("Génération du concept de jeu, de l'image et du résumé vocal..."):
+                try:
+                    # Mêmes paramètres qu'une génération complète récente : aucun appel à l'API
+                    concept = cached_concept(selected_genre, selected_mood, keywords_input, num_images)
+                except LookupError:
+                    # Le concept s'affiche au fil du streaming GPT, DALL-E et TTS tournent en parallèle
+                    stream_placeholder = st.empty()
+                    concept = asyncio.run(run_pipeline(selected_genre, selected_mood, keywords_input, num_images, placeholder=stream_placeholder))
+                    stream_placeholder.empty()
+                    # Seuls les concepts complets sont mis en cache : après un échec, un nouvel essai rappelle l'API
+                    if concept and concept["complete"]:
+                        cached_concept(selected_genre, selected_mood, keywords_input, num_images, _concept=concept)
+
+            if concept:
                 # Stocker dans session_state
-                st.session_state.game_title = game_title
-                st.session_state.game_genre = game_genre
-                st.session_state.game_summary = game_summary
-
-                st.subheader("Concept de Jeu Généré :")
-                st.write(f"**Titre :** {st.session_state.game_title}")
-                st.write(f"**Genre :** {st.session_state.game_genre}") # Affichage unique du genre
-                st.write(f"**Résumé :** {st.session_state.game_summary}")
-
-                # 2. Génération de l'image (DALL-E)
-                # Utiliser le titre et le résumé extraits pour le prompt de l'image
-                image_prompt_for_dalle = f"Pochette de jeu vidéo pour un jeu de {st.session_state.game_genre} intitulé '{st.session_state.game_title}'. Représentez le thème : {st.session_state.game_summary}"
-                st.info(f"Génération de l'image avec le prompt : '{image_prompt_for_dalle}'")
-                image_url = generate_image_from_text(image_prompt_for_dalle)
-                if image_url:
-                    st.session_state.generated_image_url = image_url
-                    st.subheader("Pochette Générée :")
-                    display_image_from_url(st.session_state.generated_image_url)
-
-                # 3. Génération de la synthèse vocale (TTS) pour le résumé
-                if st.session_state.game_summary and st.session_state.game_summary != "Aucun résumé généré.":
-                    st.subheader("Résumé Vocal :")
-                    audio_bytes = generate_speech_from_text(st.session_state.game_summary)
-                    if audio_bytes:
-                        st.audio(audio_bytes, format="audio/mpeg")
-                else:
-                    st.warning("Impossible de générer le résumé vocal car le résumé du jeu est vide ou non généré.")
+                st.session_state.game_concept = concept
+                st.session_state.game_title = concept["title"]
+                st.session_state.game_genre = concept["genre"]
+                st.session_state.game_summary = concept["summary"]
+                if concept["images"]:
+                    st.session_state.generated_images = concept["images"]
+                    st.session_state.generated_image_url = concept["images"][0][0]
             else:
                 st.error("La génération du concept de jeu a échoué.")
-    else:
-        st.warning("Veuillez sélectionner un genre, une ambiance et entrer des mots-clés.")
+        else:
+            st.warning("Veuillez sélectionner un genre, une ambiance et entrer des mots-clés.")
+
+    # Le dernier concept est affiché depuis session_state : il reste visible après
+    # une relance du script (téléchargement, autre widget) sans rappeler l'API
+    if "game_concept" in st.session_state:
+        concept = st.session_state.game_concept
+
+        st.subheader("Concept de Jeu Généré :")
+        st.write(f"**Titre :** {st.session_state.game_title}")
+        st.write(f"**Genre :** {st.session_state.game_genre}") # Affichage unique du genre
+        st.write(f"**Résumé :** {st.session_state.game_summary}")
+
+        # Pochettes (DALL-E), générées à partir du titre et du genre extraits
+        st.info(f"Image générée avec le prompt : '{concept['image_prompt']}'")
+        if concept["images"]:
+            st.subheader("Pochette Générée :")
+            images = st.session_state.generated_images
+            for i, (col, (url, png_bytes)) in enumerate(zip(st.columns(len(images)), images), start=1):
+                with col:
+                    display_image(url, png_bytes, filename=f"pochette_jeu_{i}.png")
+
+        # Synthèse vocale (TTS) du résumé
+        if st.session_state.game_summary and st.session_state.game_summary != "Aucun résumé généré.":
+            st.subheader("Résumé Vocal :")
+            if concept["audio"]:
+                st.audio(concept["audio"], format="audio/mpeg")
+        else:
+            st.warning("Impossible de générer le résumé vocal car le résumé du jeu est vide ou non généré.")
+
+concept_block()
 
 st.markdown("---")
 st.markdown("Construit avec ❤️ et les API OpenAI par Alan RENAULT")